@@ -0,0 +1,55 @@
+from typing import List, Tuple
+import numpy as np
+
+from geo import haversine_distance_vec
+
+class DangerIndex:
+    """In-process mirror of the collection for the danger check in /routes.
+
+    The danger query vector is a fixed constant, so each point's cosine similarity to it is
+    computed once on insert. A query is then an exact geo filter plus a per-sample top-k over
+    that array: no RPC, no approximate graph, and no cap on how many points are considered.
+    """
+
+    def __init__(self, concept_vector):
+        concept = np.asarray(concept_vector, dtype=np.float32)
+        self.concept = concept / np.linalg.norm(concept)
+        self.scores = np.empty(0, dtype=np.float32)
+        self.lats = np.empty(0)
+        self.lngs = np.empty(0)
+        self.texts: List[str] = []
+        self.ids = set()
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, ids, vectors, payloads: List[dict]) -> None:
+        """Adds points (ids, vectors + payloads), storing each point's similarity to the concept.
+
+        Ids already in the index are skipped, so a point seen by both a reload and /report counts once.
+        """
+        new = [n for n, point_id in enumerate(ids) if point_id not in self.ids]
+        if not new:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(payloads), -1)[new]
+        payloads = [payloads[n] for n in new]
+        self.ids.update(ids[n] for n in new)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        self.scores = np.concatenate([self.scores, (vectors @ self.concept) / norms])
+        self.lats = np.append(self.lats, [pl["location"]["lat"] for pl in payloads])
+        self.lngs = np.append(self.lngs, [pl["location"]["lon"] for pl in payloads])
+        self.texts.extend(pl.get("text", "") for pl in payloads)
+
+    def query(self, samp_lat: np.ndarray, samp_lng: np.ndarray, radius: float, limit: int) -> List[Tuple[float, str]]:
+        """Top `limit` danger-similar points within `radius` meters of each sample, as (score, text)."""
+        if len(self) == 0 or len(samp_lat) == 0:
+            return []
+        dist = haversine_distance_vec(self.lats[:, None], self.lngs[:, None], samp_lat[None, :], samp_lng[None, :])
+        hits = []
+        for j in range(len(samp_lat)):
+            near = np.flatnonzero(dist[:, j] < radius)
+            # Stable sort keeps insertion order among equal scores, like ties in a Qdrant result
+            top = near[np.argsort(-self.scores[near], kind="stable")[:limit]]
+            hits.extend((float(self.scores[i]), self.texts[i]) for i in top)
+        return hits
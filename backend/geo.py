@@ -0,0 +1,25 @@
+import math
+import numpy as np
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    """Calculate distance in meters between two coordinates."""
+    # Scalars stay on pure math (far cheaper than numpy per call); array-likes use the vectorized sibling
+    if any(np.ndim(x) > 0 for x in (lat1, lon1, lat2, lon2)):
+        return haversine_distance_vec(lat1, lon1, lat2, lon2)
+    R = 6371000  # radius of Earth in meters
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+def haversine_distance_vec(lat1_arr, lon1_arr, lat2, lon2) -> np.ndarray:
+    """Vectorized haversine distance in meters; inputs broadcast like NumPy arrays."""
+    R = 6371000  # radius of Earth in meters
+    phi1, phi2 = np.radians(lat1_arr), np.radians(lat2)
+    dphi = np.radians(np.subtract(lat2, lat1_arr))
+    dlambda = np.radians(np.subtract(lon2, lon1_arr))
+    a = np.sin(dphi / 2)**2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
@@ -1,13 +1,19 @@
-import math
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException
+import functools
+import hashlib
+import os
+import numpy as np
+from typing import Dict, List, Tuple
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from fastembed import TextEmbedding
+from geo import haversine_distance_vec
+from danger_index import DangerIndex
 import logging
-import requests
+import httpx
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,24 +37,36 @@ DEMO_CENTER_LNG = -73.9934
 COLLECTION_NAME = "city_vibes_nyc"
 
 # Initialize Qdrant Client (Auto-fallback to local mode if server is missing)
+# The probe uses a throwaway sync client; all serving calls go through the async client.
 try:
-    qdrant = QdrantClient(host="localhost", port=6333, timeout=1.0)
-    qdrant.get_collections() # Test connection
+    probe = QdrantClient(host="localhost", port=6333, timeout=1.0)
+    probe.get_collections() # Test connection
+    probe.close()
+    qdrant = AsyncQdrantClient(host="localhost", port=6333, timeout=1.0)
     logger.info("Connected to Qdrant Server at localhost:6333")
 except Exception as e:
     logger.warning("Qdrant Server not found. Using Local Embedded Mode (./qdrant_data).")
-    qdrant = QdrantClient(path="./qdrant_data")
+    qdrant = AsyncQdrantClient(path="./qdrant_data")
+
+# Shared async HTTP client for OSRM + Socrata, so both reuse one keep-alive connection pool
+http_client = httpx.AsyncClient(timeout=10.0, http2=True)
 
 # Initialize Embedding Model (downloaded on first run)
 logger.info("Loading FastEmbed model...")
-embedding_model = TextEmbedding(model_name="BAAI/bge-small-en-v1.5")
+EMBEDDING_MODEL_NAME = "BAAI/bge-small-en-v1.5"
+embedding_model = TextEmbedding(model_name=EMBEDDING_MODEL_NAME)
 VECTOR_SIZE = 384
+SEED_CACHE_PATH = "./seed_cache.npz"
+# Pipeline batch for seeding; each batch is embedded in-process by one worker thread
+SEED_BATCH_SIZE = 128
 logger.info("FastEmbed model loaded.")
 
 # Pre-compute concept vectors ONCE at startup (major optimization)
 logger.info("Pre-computing concept vectors...")
-DANGER_CONCEPT_VECTOR = list(embedding_model.embed(["Crime, assault, robbery, danger, dark, scary"]))[0].tolist()
-VIBE_CONCEPT_VECTOR = list(embedding_model.embed(["Fun, delicious, beautiful, safe, happy"]))[0].tolist()
+DANGER_CONCEPT_VECTOR = next(iter(embedding_model.embed(["Crime, assault, robbery, danger, dark, scary"])))
+VIBE_CONCEPT_VECTOR = next(iter(embedding_model.embed(["Fun, delicious, beautiful, safe, happy"])))
+# Build the NearestQuery once so tolist() does not run on every recommendation query
+VIBE_QUERY = models.NearestQuery.model_construct(nearest=VIBE_CONCEPT_VECTOR.tolist())
 # DANGER_CONCEPT_VECTOR = [0.0] * VECTOR_SIZE
 # VIBE_CONCEPT_VECTOR = [0.0] * VECTOR_SIZE
 logger.info("Concept vectors cached.")
@@ -82,44 +100,160 @@ class RouteOption(BaseModel):
     recommendations: List[Recommendation]
 
 # ---------------- Helpers ----------------
-def get_vector(text: str) -> List[float]:
-    """Generate vector for text using FastEmbed."""
+@functools.lru_cache(maxsize=4096)
+def get_vector(text: str) -> Tuple[float, ...]:
+    """Generate vector for text using FastEmbed (cached; repeat texts skip the model)."""
     vectors = list(embedding_model.embed([text]))
-    return vectors[0].tolist() # type: ignore
+    return tuple(vectors[0].tolist()) # type: ignore
     # MOCKED FOR DEBUGGING
     # return [0.0] * VECTOR_SIZE
 
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance in meters between two coordinates."""
-    R = 6371000  # radius of Earth in meters
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+# Query models below are built with `model_construct`, skipping Pydantic validation:
+# every input is already a typed float/str (validated by FastAPI or a constant).
+REVIEW_TYPE_CONDITION = models.FieldCondition.model_construct(
+    key="type", match=models.MatchValue.model_construct(value="review")
+)
+
+# Quantized candidates are re-scored against the original FP32 vectors
+RESCORE_SEARCH_PARAMS = models.SearchParams.model_construct(
+    quantization=models.QuantizationSearchParams.model_construct(rescore=True)
+)
+
+def geo_radius_filter(lat: float, lng: float, radius: float) -> models.Filter:
+    """Builds a `location` geo-radius filter without validation."""
+    return models.Filter.model_construct(
+        must=[
+            models.FieldCondition.model_construct(
+                key="location",
+                geo_radius=models.GeoRadius.model_construct(
+                    center=models.GeoPoint.model_construct(lat=lat, lon=lng), radius=radius
+                )
+            )
+        ]
+    )
+
+# ---------------- In-process Danger Index ----------------
+# Qdrant stays the source of truth; this mirror serves the danger hot path in /routes without
+# any RPC. It holds every point, since the danger query never filtered by type. Reports from
+# this process are added on write; reports written by other workers/processes sharing the
+# collection are picked up by a periodic reload (at most DANGER_INDEX_REFRESH_SECONDS late).
+DANGER_INDEX_REFRESH_SECONDS = 15.0
+danger_index = DangerIndex(DANGER_CONCEPT_VECTOR)
+danger_index_refresh_task = None
+
+async def load_danger_index() -> DangerIndex:
+    """Builds a fresh mirror of every point in the collection."""
+    index = DangerIndex(DANGER_CONCEPT_VECTOR)
+    offset = None
+    while True:
+        records, offset = await qdrant.scroll(
+            collection_name=COLLECTION_NAME,
+            limit=256,
+            offset=offset,
+            with_payload=models.PayloadSelectorInclude(include=["text", "location"]),
+            with_vectors=True
+        )
+        index.add([r.id for r in records], [r.vector for r in records], [r.payload for r in records])
+        if offset is None:
+            break
+    logger.info(f"Danger index built with {len(index)} points.")
+    return index
+
+async def refresh_danger_index_periodically() -> None:
+    """Reloads the danger index whenever the collection holds points this process hasn't seen."""
+    global danger_index
+    while True:
+        await asyncio.sleep(DANGER_INDEX_REFRESH_SECONDS)
+        try:
+            count = (await qdrant.count(collection_name=COLLECTION_NAME, exact=True)).count
+            if count != len(danger_index):
+                # A report this process adds mid-reload may be missed; the count check
+                # then still differs, so the next cycle picks it up
+                danger_index = await load_danger_index()
+        except Exception as e:
+            logger.error(f"Danger index refresh failed: {e}")
 
 # ---------------- Startup & Seeding ----------------
 @app.on_event("startup")
 async def startup_event():
+    global danger_index, danger_index_refresh_task
     # Check if collection exists
     try:
-        collections = qdrant.get_collections()
+        collections = await qdrant.get_collections()
         exists = any(c.name == COLLECTION_NAME for c in collections.collections)
     except Exception:
         exists = False # Robustness
 
     if not exists:
         logger.info(f"Creating collection '{COLLECTION_NAME}'...")
-        qdrant.create_collection(
+        await qdrant.create_collection(
             collection_name=COLLECTION_NAME,
             vectors_config=models.VectorParams(size=VECTOR_SIZE, distance=models.Distance.COSINE),
+            # int8 scalar quantization: 4x smaller vectors in RAM and faster int8 distance math
+            quantization_config=models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=True)
+            ),
+        )
+        # Payload indexes let Qdrant's planner serve geo_radius / type filters from an index
+        await qdrant.create_payload_index(
+            collection_name=COLLECTION_NAME,
+            field_name="location",
+            field_schema=models.PayloadSchemaType.GEO,
+        )
+        await qdrant.create_payload_index(
+            collection_name=COLLECTION_NAME,
+            field_name="type",
+            field_schema=models.PayloadSchemaType.KEYWORD,
         )
         # Hybrid Seeding
         await seed_nyc_data()
     else:
         logger.info(f"Collection '{COLLECTION_NAME}' already exists.")
 
+    danger_index = await load_danger_index()
+    danger_index_refresh_task = asyncio.create_task(refresh_danger_index_periodically())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if danger_index_refresh_task is not None:
+        danger_index_refresh_task.cancel()
+    await http_client.aclose()
+    await qdrant.close()
+
+def build_seed_payload(p: dict) -> dict:
+    """Builds the Qdrant payload for a seed point."""
+    payload = {
+        "text": p["text"],
+        "type": p["type"],
+        "location": {"lat": p["lat"], "lon": p["lng"]}
+    }
+    if "name" in p:
+        payload["name"] = p["name"]
+    return payload
+
+def seed_cache_key(text: str) -> str:
+    """Stable cache key for a seed text (Python's hash() is salted per process)."""
+    return hashlib.sha1(f"{EMBEDDING_MODEL_NAME}:{text}".encode("utf-8")).hexdigest()
+
+def load_seed_cache() -> Dict[str, np.ndarray]:
+    """Loads seed vectors cached in SEED_CACHE_PATH by earlier seeds, keyed by seed_cache_key."""
+    if os.path.exists(SEED_CACHE_PATH):
+        try:
+            with np.load(SEED_CACHE_PATH) as cache:
+                return {k: cache[k] for k in cache.files}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable seed cache {SEED_CACHE_PATH}: {e}")
+    return {}
+
+def embed_missing_seed_texts(keyed_texts: Dict[str, str], cache: Dict[str, np.ndarray]) -> int:
+    """Embeds the texts whose keys are not in `cache` yet (one FastEmbed call), adding them in place."""
+    missing = {k: t for k, t in keyed_texts.items() if k not in cache}
+    if missing:
+        vectors = embedding_model.embed(list(missing.values()), batch_size=SEED_BATCH_SIZE)
+        for k, v in zip(missing, vectors):
+            cache[k] = v
+    return len(missing)
+
 async def seed_nyc_data():
     points = []
     
@@ -127,7 +261,7 @@ async def seed_nyc_data():
     try:
         data_url = "https://data.cityofnewyork.us/resource/5uac-w243.json?$limit=300&$where=latitude IS NOT NULL"
         logger.info(f"Fetching real crime data from {data_url}...")
-        response = requests.get(data_url)
+        response = await http_client.get(data_url, timeout=30.0)
         crime_data = response.json()
         
         for record in crime_data:
@@ -164,36 +298,46 @@ async def seed_nyc_data():
     
     points.extend(reviews)
     
-    # Batch Upsert
-    upsert_points = []
-    for i, p in enumerate(points):
-        vector = get_vector(p["text"])
-        payload = {
-            "text": p["text"], 
-            "type": p["type"], 
-            "location": {"lat": p["lat"], "lon": p["lng"]}
-        }
-        if "name" in p:
-            payload["name"] = p["name"]
-            
-        upsert_points.append(
-            models.PointStruct(
-                id=i,
-                vector=vector,
-                payload=payload
+    # Pipelined Embed + Upsert: a worker thread embeds batch N+1 while batch N is upserted.
+    # Only unique, not-yet-cached texts are embedded (crime descriptions repeat a lot).
+    loop = asyncio.get_running_loop()
+    cache = await loop.run_in_executor(None, load_seed_cache)
+    keys = [seed_cache_key(p["text"]) for p in points]
+    batch_starts = range(0, len(points), SEED_BATCH_SIZE)
+
+    def embed_batch(start: int) -> int:
+        end = min(start + SEED_BATCH_SIZE, len(points))
+        return embed_missing_seed_texts({keys[i]: points[i]["text"] for i in range(start, end)}, cache)
+
+    computed = 0
+    # A single worker keeps batches in order, so every text of batch N is in the cache once it finishes
+    with ThreadPoolExecutor(max_workers=1) as embed_pool:
+        pending = loop.run_in_executor(embed_pool, embed_batch, batch_starts[0])
+        for n, start in enumerate(batch_starts):
+            computed += await pending
+            if n + 1 < len(batch_starts):
+                pending = loop.run_in_executor(embed_pool, embed_batch, batch_starts[n + 1])
+
+            end = min(start + SEED_BATCH_SIZE, len(points))
+            await qdrant.upsert(
+                collection_name=COLLECTION_NAME,
+                points=[
+                    models.PointStruct(
+                        id=i,
+                        vector=cache[keys[i]].tolist(),
+                        payload=build_seed_payload(points[i])
+                    )
+                    for i in range(start, end)
+                ]
             )
-        )
-        
-        if len(upsert_points) >= 100:
-            qdrant.upsert(collection_name=COLLECTION_NAME, points=upsert_points)
-            upsert_points = []
-            
-    if upsert_points:
-        qdrant.upsert(collection_name=COLLECTION_NAME, points=upsert_points)
+
+    logger.info(f"Seed embeddings: {len(set(keys)) - computed} cached, {computed} computed.")
+    if computed:
+        await loop.run_in_executor(None, lambda: np.savez_compressed(SEED_CACHE_PATH, **cache))
         
     logger.info(f"Seeding Complete. Total Vibe Nodes: {len(points)}")
 
-def fetch_osrm_route(start: Point, end: Point, profile: str = "foot") -> List[Point]:
+async def fetch_osrm_route(start: Point, end: Point, profile: str = "foot") -> List[Point]:
     """Fetches a real route from OSRM (OpenStreetMap Routing Machine)."""
     # OSRM uses (lng, lat) order
     url = f"https://router.project-osrm.org/route/v1/{profile}/{start.lng},{start.lat};{end.lng},{end.lat}"
@@ -203,7 +347,7 @@ def fetch_osrm_route(start: Point, end: Point, profile: str = "foot") -> List[Po
         "steps": "false"
     }
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = await http_client.get(url, params=params)
         data = response.json()
         if data.get("code") == "Ok" and data.get("routes"):
             coords = data["routes"][0]["geometry"]["coordinates"]
@@ -213,27 +357,33 @@ def fetch_osrm_route(start: Point, end: Point, profile: str = "foot") -> List[Po
         logger.error(f"OSRM routing failed: {e}")
     return []
 
-def generate_real_paths(start: Point, end: Point) -> List[List[Point]]:
+async def generate_real_paths(start: Point, end: Point) -> List[List[Point]]:
     """Generates 3 real walking routes using OSRM with waypoints."""
     paths = []
     
+    # Alternate routes go via a waypoint slightly north / south of the midpoint
+    offset = 0.003  # ~300m
+    waypoint_north = Point(lat=(start.lat + end.lat) / 2 + offset, lng=(start.lng + end.lng) / 2)
+    waypoint_south = Point(lat=(start.lat + end.lat) / 2 - offset, lng=(start.lng + end.lng) / 2)
+
+    # Fetch all legs concurrently so wall time is the slowest leg, not the sum
+    direct, alt1_a, alt1_b, alt2_a, alt2_b = await asyncio.gather(
+        fetch_osrm_route(start, end, "foot"),
+        fetch_osrm_route(start, waypoint_north, "foot"),
+        fetch_osrm_route(waypoint_north, end, "foot"),
+        fetch_osrm_route(start, waypoint_south, "foot"),
+        fetch_osrm_route(waypoint_south, end, "foot"),
+    )
+
     # 1. Direct walking route
-    direct = fetch_osrm_route(start, end, "foot")
     if direct:
         paths.append(direct)
     
-    # 2. Alternate route (via a waypoint slightly north)
-    offset = 0.003  # ~300m
-    waypoint_north = Point(lat=(start.lat + end.lat) / 2 + offset, lng=(start.lng + end.lng) / 2)
-    alt1_a = fetch_osrm_route(start, waypoint_north, "foot")
-    alt1_b = fetch_osrm_route(waypoint_north, end, "foot")
+    # 2. Alternate route (via the north waypoint)
     if alt1_a and alt1_b:
         paths.append(alt1_a + alt1_b[1:])  # Avoid duplicate point
     
-    # 3. Alternate route (via a waypoint slightly south)
-    waypoint_south = Point(lat=(start.lat + end.lat) / 2 - offset, lng=(start.lng + end.lng) / 2)
-    alt2_a = fetch_osrm_route(start, waypoint_south, "foot")
-    alt2_b = fetch_osrm_route(waypoint_south, end, "foot")
+    # 3. Alternate route (via the south waypoint)
     if alt2_a and alt2_b:
         paths.append(alt2_a + alt2_b[1:])
     
@@ -246,7 +396,7 @@ def generate_real_paths(start: Point, end: Point) -> List[List[Point]]:
 
 
 
-def score_route(path: List[Point]) -> dict:
+async def score_route(path: List[Point]) -> dict:
     """Scores route and finds recommendations. OPTIMIZED: samples 10 points max."""
     
     total_danger_score = 0
@@ -254,68 +404,59 @@ def score_route(path: List[Point]) -> dict:
     detected_tags = []
     recommendations = []
     
-    # Use cached concept vectors (no per-request embedding!)
-    danger_query = DANGER_CONCEPT_VECTOR
-    vibe_query = VIBE_CONCEPT_VECTOR
-
     # OPTIMIZATION: Sample only 10 evenly-spaced points (instead of 50-200+)
+    # linspace covers the whole route including both endpoints
     sample_count = min(10, len(path))
-    step = max(1, len(path) // sample_count)
-    sampled_points = [path[i] for i in range(0, len(path), step)][:sample_count]
+    idx = np.linspace(0, len(path) - 1, sample_count, dtype=np.int64)
+    sampled_points = [path[i] for i in idx]
+    samp_lat = np.array([p.lat for p in sampled_points])
+    samp_lng = np.array([p.lng for p in sampled_points])
     
     logger.debug(f"Scoring route: {len(path)} points, sampling {len(sampled_points)}")
 
-    # Sample points along path
-    for p in sampled_points:
-        # 1. Check Danger
-        danger_hits = qdrant.query_points(
-            collection_name=COLLECTION_NAME,
-            query=danger_query,
-            limit=2,
-            query_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="location",
-                        geo_radius=models.GeoRadius(center=models.GeoPoint(lat=p.lat, lon=p.lng), radius=150.0)
-                    )
-                ]
-            )
-        ).points
-        
-        for hit in danger_hits:
-            # Lower threshold even more (0.60) to ensure reports hit hard
-            if hit.score > 0.60:
-                total_danger_score += hit.score
-                hit_count += 1
-                logger.info(f"Danger hit: score={hit.score:.2f}, text={hit.payload.get('text', '')[:50]}")
-                tag = hit.payload.get("text", "").split(":")[0] # e.g. "Crime Report"
-                if len(tag) < 30 and tag not in detected_tags:
-                    detected_tags.append(tag)
-
-        # 2. Check Recommendations (Positive Vibes)
-        # Only if we haven't found too many already
-        if len(recommendations) < 2:
-            rec_hits = qdrant.query_points(
-                collection_name=COLLECTION_NAME,
-                query=vibe_query,
-                limit=1,
-                query_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="location",
-                            geo_radius=models.GeoRadius(center=models.GeoPoint(lat=p.lat, lon=p.lng), radius=100.0)
-                        ),
-                        models.FieldCondition(key="type", match=models.MatchValue(value="review"))
-                    ]
-                )
-            ).points
-            for hit in rec_hits:
-                if hit.score > 0.75: # It's a positive vibe
-                    name = hit.payload.get("name", "Unknown Spot")
-                    desc = hit.payload.get("text", "")
-                    # Deduplicate 
-                    if not any(r["name"] == name for r in recommendations):
-                        recommendations.append({"name": name, "description": desc, "type": "place"})
+    # 1. Check Danger: in-process, exact geo filter + top-2 per sample point
+    for score, text in danger_index.query(samp_lat, samp_lng, radius=150.0, limit=2):
+        # Lower threshold even more (0.60) to ensure reports hit hard
+        if score > 0.60:
+            total_danger_score += score
+            hit_count += 1
+            logger.info(f"Danger hit: score={score:.2f}, text={text[:50]}")
+            tag = text.split(":")[0] # e.g. "Crime Report"
+            if len(tag) < 30 and tag not in detected_tags:
+                detected_tags.append(tag)
+
+    # 2. Check Recommendations (Positive Vibes): ONE route-wide vibe query, geo-checked locally below
+    rec_result = await qdrant.query_points(
+        collection_name=COLLECTION_NAME,
+        query=VIBE_QUERY,
+        limit=8,
+        with_payload=True,
+        search_params=RESCORE_SEARCH_PARAMS,
+        query_filter=models.Filter.model_construct(must=[REVIEW_TYPE_CONDITION])
+    )
+
+    # Keep the best positive vibes that lie within 100m of the route:
+    # one broadcast (hits x samples) haversine instead of a Python double loop
+    rec_hits = rec_result.points
+    near_route = np.zeros(len(rec_hits), dtype=bool)
+    if rec_hits and sampled_points:
+        hit_lats = np.array([h.payload["location"]["lat"] for h in rec_hits])
+        hit_lngs = np.array([h.payload["location"]["lon"] for h in rec_hits])
+        dist = haversine_distance_vec(hit_lats[:, None], hit_lngs[:, None], samp_lat[None, :], samp_lng[None, :])
+        near_route = dist.min(axis=1) < 100.0
+
+    for hit, is_near in zip(rec_hits, near_route):
+        if len(recommendations) >= 2:
+            break
+        if hit.score <= 0.75: # Not a positive vibe; hits are sorted, so none after this are either
+            break
+        if not is_near:
+            continue
+        name = hit.payload.get("name", "Unknown Spot")
+        desc = hit.payload.get("text", "")
+        # Deduplicate 
+        if not any(r["name"] == name for r in recommendations):
+            recommendations.append({"name": name, "description": desc, "type": "place"})
 
     # Scoring Logic
     # 0 hits = 10/10. 
@@ -337,14 +478,15 @@ async def get_routes(start_lat: float, start_lng: float, end_lat: float, end_lng
     start = Point(lat=start_lat, lng=start_lng)
     end = Point(lat=end_lat, lng=end_lng)
     
-    paths = generate_real_paths(start, end)
+    paths = await generate_real_paths(start, end)
     
     response = []
     descriptions = ["Direct Walking Route", "North Alternate", "South Alternate"]
     
-    for i, path in enumerate(paths):
-        analysis = score_route(path)
-        
+    # Score all route options concurrently
+    analyses = await asyncio.gather(*(score_route(path) for path in paths))
+    
+    for i, (path, analysis) in enumerate(zip(paths, analyses)):
         response.append(RouteOption(
             id=f"route-{i}",
             path=path,
@@ -359,29 +501,33 @@ async def get_routes(start_lat: float, start_lng: float, end_lat: float, end_lng
 @app.post("/report")
 async def report_vibe(report: VibeReport):
     """Evolving Memory: User reports a new vibe node."""
-    vector = get_vector(report.description)
+    loop = asyncio.get_running_loop()
+    vector = await loop.run_in_executor(None, get_vector, report.description)
     import uuid
     import datetime
     point_id = str(uuid.uuid4())
     timestamp = datetime.datetime.now().isoformat()
     
-    qdrant.upsert(
+    payload = {
+        "text": report.description,
+        "type": report.type,
+        "location": {"lat": report.lat, "lon": report.lng},
+        "source": "user_report",
+        "timestamp": timestamp,
+        "severity": "high" # Assume user reports are significant
+    }
+    await qdrant.upsert(
         collection_name=COLLECTION_NAME,
         points=[
             models.PointStruct(
                 id=point_id,
-                vector=vector,
-                payload={
-                    "text": report.description,
-                    "type": report.type,
-                    "location": {"lat": report.lat, "lon": report.lng},
-                    "source": "user_report",
-                    "timestamp": timestamp,
-                    "severity": "high" # Assume user reports are significant
-                }
+                vector=list(vector),
+                payload=payload
             )
         ]
     )
+    # Keep the in-process danger index in sync so the report affects the next /routes call
+    danger_index.add([point_id], [vector], [payload])
     logger.info(f"Report added: '{report.description}' at ({report.lat}, {report.lng})")
     return {"status": "success", "message": "Vibe memory updated. Search again to see impact.", "location": {"lat": report.lat, "lng": report.lng}}
 
@@ -390,20 +536,15 @@ async def get_nearby_vibes(lat: float, lng: float, radius: float = 200.0):
     """Returns all vibe nodes (crimes, reviews, reports) near a location."""
     try:
         # Use scroll to get all points matching the filter
-        results, _ = qdrant.scroll(
+        results, _ = await qdrant.scroll(
             collection_name=COLLECTION_NAME,
-            scroll_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="location",
-                        geo_radius=models.GeoRadius(
-                            center=models.GeoPoint(lat=lat, lon=lng),
-                            radius=radius
-                        )
-                    )
-                ]
+            scroll_filter=geo_radius_filter(lat, lng, radius),
+            limit=20,
+            # Only fetch the fields the response uses; skip vectors entirely
+            with_payload=models.PayloadSelectorInclude(
+                include=["text", "type", "source", "name", "timestamp", "location"]
             ),
-            limit=20
+            with_vectors=False
         )
         
         vibes = []
@@ -0,0 +1,89 @@
+import numpy as np
+
+from danger_index import DangerIndex
+from geo import haversine_distance
+
+DIM = 384
+CENTER_LAT, CENTER_LNG = 40.7505, -73.9934
+
+def make_points(n, distinct, rng):
+    """n points near CENTER sharing only `distinct` vectors, like repeated pd_desc seed texts."""
+    base = rng.normal(size=(distinct, DIM)).astype(np.float32)
+    kinds = np.arange(n) % distinct
+    vectors = base[kinds]
+    payloads = [
+        {
+            "text": f"Crime Report: KIND {k}",
+            "location": {"lat": CENTER_LAT + rng.uniform(-0.003, 0.003), "lon": CENTER_LNG + rng.uniform(-0.003, 0.003)},
+        }
+        for k in kinds
+    ]
+    return base, vectors, payloads
+
+def expected_hits(base, vectors, payloads, concept, samp_lat, samp_lng, radius, limit):
+    """Brute-force reference: per sample, top `limit` cosine scores within `radius`."""
+    concept = concept / np.linalg.norm(concept)
+    scores = vectors @ concept / np.linalg.norm(vectors, axis=1)
+    hits = []
+    for lat, lng in zip(samp_lat, samp_lng):
+        near = [
+            i for i, pl in enumerate(payloads)
+            if haversine_distance(pl["location"]["lat"], pl["location"]["lon"], lat, lng) < radius
+        ]
+        near.sort(key=lambda i: -scores[i])
+        hits.extend((scores[i], payloads[i]["text"]) for i in near[:limit])
+    return hits
+
+def test_duplicated_vectors_give_exact_top_k_per_sample():
+    rng = np.random.default_rng(0)
+    for distinct in (1, 3, 8, 15):
+        base, vectors, payloads = make_points(306, distinct, rng)
+        concept = base[0] + 0.1 * rng.normal(size=DIM).astype(np.float32)
+        index = DangerIndex(concept)
+        index.add(list(range(len(payloads))), vectors, payloads)
+
+        samp_lat = np.linspace(CENTER_LAT - 0.003, CENTER_LAT + 0.003, 10)
+        samp_lng = np.linspace(CENTER_LNG - 0.003, CENTER_LNG + 0.003, 10)
+        hits = index.query(samp_lat, samp_lng, radius=150.0, limit=2)
+        expected = expected_hits(base, vectors, payloads, concept, samp_lat, samp_lng, 150.0, 2)
+
+        assert len(hits) == len(expected)
+        for (score, text), (exp_score, exp_text) in zip(hits, expected):
+            assert np.isclose(score, exp_score, atol=1e-5)
+            assert text == exp_text
+
+def test_incremental_adds_and_repeated_report_hit():
+    rng = np.random.default_rng(1)
+    base, vectors, payloads = make_points(1500, 3, rng)
+    concept = base[0]
+    index = DangerIndex(concept)
+    ids = list(range(len(payloads)))
+    for start in range(0, len(payloads), 256):
+        end = start + 256
+        index.add(ids[start:end], vectors[start:end], payloads[start:end])
+
+    # A repeated /report: identical vector added again, right next to a sample point
+    report = {"text": "mugging here", "location": {"lat": CENTER_LAT, "lon": CENTER_LNG}}
+    index.add(["report-1"], [concept * 2.0], [report])
+
+    assert len(index) == 1501
+    hits = index.query(np.array([CENTER_LAT]), np.array([CENTER_LNG]), radius=150.0, limit=2)
+    assert len(hits) == 2
+    assert all(np.isclose(score, 1.0, atol=1e-5) for score, _ in hits)
+
+def test_empty_index_and_no_samples():
+    index = DangerIndex(np.ones(DIM, dtype=np.float32))
+    assert index.query(np.array([CENTER_LAT]), np.array([CENTER_LNG]), radius=150.0, limit=2) == []
+    index.add([0], [np.ones(DIM)], [{"text": "x", "location": {"lat": CENTER_LAT, "lon": CENTER_LNG}}])
+    assert index.query(np.empty(0), np.empty(0), radius=150.0, limit=2) == []
+
+def test_points_already_indexed_are_skipped():
+    index = DangerIndex(np.ones(DIM, dtype=np.float32))
+    report = {"text": "mugging here", "location": {"lat": CENTER_LAT, "lon": CENTER_LNG}}
+    index.add(["report-1"], [np.ones(DIM)], [report])
+    # The same point seen again (e.g. by a reload racing /report) must not count twice
+    index.add(["report-1", "report-2"], [np.ones(DIM), np.ones(DIM)], [report, report])
+
+    assert len(index) == 2
+    hits = index.query(np.array([CENTER_LAT]), np.array([CENTER_LNG]), radius=150.0, limit=5)
+    assert len(hits) == 2
@@ -0,0 +1,26 @@
+import numpy as np
+
+from geo import haversine_distance, haversine_distance_vec
+
+# Times Square -> Bryant Park, roughly 400m apart
+A = (40.7580, -73.9855)
+B = (40.7536, -73.9832)
+
+def test_scalar_matches_vectorized():
+    scalar = haversine_distance(*A, *B)
+    assert isinstance(scalar, float)
+    assert 400 < scalar < 600
+    assert np.isclose(scalar, haversine_distance_vec(*A, *B))
+
+def test_array_like_in_any_argument_dispatches_to_vectorized():
+    expected = haversine_distance(*A, *B)
+    cases = [
+        (np.array([A[0], A[0]]), A[1], *B),
+        (A[0], np.array([A[1], A[1]]), *B),
+        (*A, [B[0], B[0]], B[1]),
+        (*A, B[0], (B[1], B[1])),
+    ]
+    for args in cases:
+        dist = haversine_distance(*args)
+        assert np.shape(dist) == (2,)
+        assert np.allclose(dist, expected)